@@ -3,13 +3,18 @@ Flask Backend API for B2B Marketplace Scraper
 Provides REST API endpoints for scraping and data analysis
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import scrapers
 from scraper_multi_source import MultiSourceScraper
@@ -21,7 +26,132 @@ CORS(app)  # Enable CORS for frontend
 DATA_DIR = 'data'
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# Global scraping status
+# Available scraping sources and product categories
+SOURCES = [
+    {
+        'id': 'tradeindia',
+        'name': 'TradeIndia',
+        'status': 'active',
+        'description': 'Indian B2B marketplace - Reliable'
+    },
+    {
+        'id': 'alibaba',
+        'name': 'Alibaba',
+        'status': 'active',
+        'description': 'Global B2B platform - Partial access'
+    },
+    {
+        'id': 'dhgate',
+        'name': 'DHgate',
+        'status': 'active',
+        'description': 'Wholesale marketplace - Good access'
+    },
+    {
+        'id': 'sample',
+        'name': 'Enhanced Sample Data',
+        'status': 'active',
+        'description': 'High-quality generated data'
+    }
+]
+
+CATEGORIES = [
+    {'id': 'industrial_machinery', 'name': 'Industrial Machinery'},
+    {'id': 'electronic_components', 'name': 'Electronic Components'},
+    {'id': 'textile_fabrics', 'name': 'Textile Fabrics'},
+    {'id': 'plastic_raw_materials', 'name': 'Plastic Raw Materials'},
+    {'id': 'safety_equipment', 'name': 'Safety Equipment'}
+]
+
+# Both lists are constant, so serialize their responses once (same format as jsonify)
+SOURCES_JSON = app.json.dumps({'success': True, 'sources': SOURCES}, separators=(',', ':')) + '\n'
+CATEGORIES_JSON = app.json.dumps({'success': True, 'categories': CATEGORIES}, separators=(',', ':')) + '\n'
+
+# Columns needed for dataset summaries
+SUMMARY_COLUMNS = ['category', 'source', 'price_numeric']
+
+# Fixed CSV types for those columns (an all-empty column would otherwise be read as type null)
+SUMMARY_TYPES = {'category': pa.string(), 'source': pa.string(), 'price_numeric': pa.float64()}
+
+def list_dataset_files():
+    """List dataset files, preferring Parquet over a CSV copy of the same dataset"""
+    files = os.listdir(DATA_DIR)
+    parquet_stems = {os.path.splitext(f)[0] for f in files if f.endswith('.parquet')}
+    
+    return [
+        f for f in files
+        if f.endswith('.parquet') or (f.endswith('.csv') and os.path.splitext(f)[0] not in parquet_stems)
+    ]
+
+def download_name(filename):
+    """File offered for download: a Parquet dataset's CSV copy when there is one"""
+    stem, ext = os.path.splitext(filename)
+    if ext == '.parquet' and os.path.exists(os.path.join(DATA_DIR, stem + '.csv')):
+        return stem + '.csv'
+    return filename
+
+def read_dataset(filepath, columns=None):
+    """Read a Parquet or CSV dataset, loading only the given columns if they exist"""
+    if filepath.endswith('.parquet'):
+        if columns is not None:
+            available = pq.read_schema(filepath).names
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(filepath, columns=columns)
+    
+    if columns is not None:
+        return pd.read_csv(filepath, usecols=lambda c: c in columns)
+    return pd.read_csv(filepath)
+
+def read_preview(filepath, n_rows=20):
+    """Read the first rows of a dataset as JSON-ready records"""
+    if filepath.endswith('.parquet'):
+        batch = next(pq.ParquetFile(filepath).iter_batches(batch_size=n_rows), None)
+        return batch.to_pylist() if batch is not None else []
+    
+    # Round-trip through to_json so NaN cells serialize as null
+    df = pd.read_csv(filepath, nrows=n_rows)
+    return json.loads(df.to_json(orient='records', force_ascii=False))
+
+def read_dataset_meta(filepath):
+    """Get row/category/source/price counts for a dataset, preferring its .meta.json sidecar"""
+    meta_file = os.path.splitext(filepath)[0] + '.meta.json'
+    if os.path.exists(meta_file):
+        with open(meta_file, encoding='utf-8') as f:
+            return json.load(f)
+    
+    # No sidecar (older datasets): count with Arrow, decoding only the summary columns
+    if filepath.endswith('.parquet'):
+        available = pq.read_schema(filepath).names
+        columns = [c for c in SUMMARY_COLUMNS if c in available]
+        table = pq.read_table(filepath, columns=columns)
+    else:
+        available = pacsv.open_csv(filepath).schema.names
+        columns = [c for c in SUMMARY_COLUMNS if c in available]
+        table = pacsv.read_csv(filepath, convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types=SUMMARY_TYPES,
+            strings_can_be_null=True
+        ))
+    
+    return {
+        'rows': table.num_rows,
+        'categories': pc.count_distinct(table['category']).as_py() if 'category' in columns else 0,
+        'sources': pc.count_distinct(table['source']).as_py() if 'source' in columns else 0,
+        'with_prices': pc.count(table['price_numeric']).as_py() if 'price_numeric' in columns else 0
+    }
+
+def data_dir_key():
+    """Snapshot of dataset/sidecar names and mtimes; changes whenever a dataset is written"""
+    return tuple(sorted(
+        (f, os.path.getmtime(os.path.join(DATA_DIR, f)))
+        for f in os.listdir(DATA_DIR)
+        if f.endswith(('.parquet', '.csv', '.meta.json'))
+    ))
+
+# Cached /api/datasets and /api/stats results, keyed by data_dir_key()
+datasets_cache = {'key': None, 'value': None}
+stats_cache = {'key': None, 'value': None}
+
+# Global scraping status (written by the scraping thread, read by /api/status)
 scraping_status = {
     'is_scraping': False,
     'progress': 0,
@@ -29,6 +159,34 @@ scraping_status = {
     'total_products': 0,
     'message': 'Ready'
 }
+status_lock = threading.Lock()
+# Bumped on every change and served as the /api/status ETag. Starts from the
+# boot time so a browser-cached ETag from a previous server run never matches.
+status_version = int(datetime.now().timestamp() * 1000)
+
+def update_status(**changes):
+    """Apply changes to the scraping status and bump its version"""
+    global status_version
+    
+    with status_lock:
+        scraping_status.update(changes)
+        status_version += 1
+
+def claim_scraping():
+    """Mark a scrape as started unless one is already running; returns whether it was claimed"""
+    global status_version
+    
+    # Check and set under one lock so concurrent requests cannot both start a scrape
+    with status_lock:
+        if scraping_status['is_scraping']:
+            return False
+        
+        scraping_status.update(is_scraping=True, progress=0, total_products=0)
+        status_version += 1
+        return True
+
+# Scrape jobs run one at a time off the request threads
+scrape_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scrape')
 
 @app.route('/')
 def index():
@@ -38,66 +196,16 @@ def index():
 @app.route('/api/sources', methods=['GET'])
 def get_sources():
     """Get list of available scraping sources"""
-    sources = [
-        {
-            'id': 'tradeindia',
-            'name': 'TradeIndia',
-            'status': 'active',
-            'description': 'Indian B2B marketplace - Reliable'
-        },
-        {
-            'id': 'alibaba',
-            'name': 'Alibaba',
-            'status': 'active',
-            'description': 'Global B2B platform - Partial access'
-        },
-        {
-            'id': 'dhgate',
-            'name': 'DHgate',
-            'status': 'active',
-            'description': 'Wholesale marketplace - Good access'
-        },
-        {
-            'id': 'sample',
-            'name': 'Enhanced Sample Data',
-            'status': 'active',
-            'description': 'High-quality generated data'
-        }
-    ]
-   
-    
-    return jsonify({
-        'success': True,
-        'sources': sources
-    })
+    return Response(SOURCES_JSON, mimetype='application/json')
 
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """Get available product categories"""
-    categories = [
-        {'id': 'industrial_machinery', 'name': 'Industrial Machinery'},
-        {'id': 'electronic_components', 'name': 'Electronic Components'},
-        {'id': 'textile_fabrics', 'name': 'Textile Fabrics'},
-        {'id': 'plastic_raw_materials', 'name': 'Plastic Raw Materials'},
-        {'id': 'safety_equipment', 'name': 'Safety Equipment'}
-    ]
-    
-    return jsonify({
-        'success': True,
-        'categories': categories
-    })
+    return Response(CATEGORIES_JSON, mimetype='application/json')
 
 @app.route('/api/scrape', methods=['POST'])
 def start_scraping():
     """Start scraping process"""
-    global scraping_status
-    
-    if scraping_status['is_scraping']:
-        return jsonify({
-            'success': False,
-            'message': 'Scraping already in progress'
-        }), 400
-    
     data = request.get_json()
     categories = data.get('categories', [])
     sources = data.get('sources', ['tradeindia'])
@@ -109,12 +217,14 @@ def start_scraping():
             'message': 'Please select at least one category'
         }), 400
     
-    # Start scraping in background thread
-    thread = threading.Thread(
-        target=run_scraping,
-        args=(categories, sources, products_per_category)
-    )
-    thread.start()
+    if not claim_scraping():
+        return jsonify({
+            'success': False,
+            'message': 'Scraping already in progress'
+        }), 400
+    
+    # Start scraping in the background
+    scrape_executor.submit(run_scraping, categories, sources, products_per_category)
     
     return jsonify({
         'success': True,
@@ -123,57 +233,75 @@ def start_scraping():
     })
 
 def run_scraping(categories, sources, products_per_category):
-    """Background scraping task"""
-    global scraping_status
-    
-    scraping_status['is_scraping'] = True
-    scraping_status['progress'] = 0
-    scraping_status['total_products'] = 0
-    
+    """Background scraping task (the caller has already claimed the status via claim_scraping)"""
     try:
         scraper = MultiSourceScraper()
+        real_sources = [s for s in sources if s != 'sample']
         
-        for i, category in enumerate(categories):
-            scraping_status['current_category'] = category.replace('_', ' ').title()
-            scraping_status['progress'] = int((i / len(categories)) * 100)
-            scraping_status['message'] = f'Scraping {scraping_status["current_category"]}...'
-            
-            # Scrape category
-            category_name = category.replace('_', ' ')
+        def scrape_one(category_name):
+            """Scrape a single category"""
             # Scrape from selected real sources
-            real_sources = [s for s in sources if s != 'sample']
             if real_sources:
                 scraper.scrape_category(category_name, sources=real_sources, max_per_source=15)
             
             # Add sample data if selected
             if 'sample' in sources:
                 scraper.add_sample_products(category_name, count=35)
+        
+        update_status(message=f'Scraping {len(categories)} categories...')
+        
+        # Categories are independent and network-bound, so scrape them concurrently
+        with ThreadPoolExecutor(max_workers=len(categories)) as executor:
+            futures = {
+                executor.submit(scrape_one, category.replace('_', ' ')): category
+                for category in categories
+            }
             
-            
-            
-            scraping_status['total_products'] = len(scraper.products)
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                
+                current_category = futures[future].replace('_', ' ').title()
+                update_status(
+                    current_category=current_category,
+                    progress=int((done / len(categories)) * 100),
+                    message=f'Finished {current_category} ({done}/{len(categories)})',
+                    total_products=len(scraper.products)
+                )
         
         # Save data
         csv_file, json_file = scraper.save_data()
         
-        scraping_status['progress'] = 100
-        scraping_status['message'] = f'Completed! {len(scraper.products)} products scraped'
-        scraping_status['csv_file'] = csv_file
-        scraping_status['json_file'] = json_file
+        update_status(
+            progress=100,
+            message=f'Completed! {len(scraper.products)} products scraped',
+            csv_file=csv_file,
+            json_file=json_file
+        )
         
     except Exception as e:
-        scraping_status['message'] = f'Error: {str(e)}'
+        update_status(message=f'Error: {str(e)}')
     
     finally:
-        scraping_status['is_scraping'] = False
+        update_status(is_scraping=False)
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
-    """Get current scraping status"""
-    return jsonify({
-        'success': True,
-        'status': scraping_status
-    })
+    """Get current scraping status (304 if unchanged since the client's ETag)"""
+    with status_lock:
+        etag = str(status_version)
+        status = dict(scraping_status)
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify({
+            'success': True,
+            'status': status
+        })
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate with the ETag
+    return response
 
 @app.route('/api/datasets', methods=['GET'])
 def get_datasets():
@@ -181,10 +309,17 @@ def get_datasets():
     datasets = []
     
     try:
-        files = os.listdir(DATA_DIR)
-        csv_files = [f for f in files if f.endswith('.csv')]
+        # Reuse the last listing if no dataset changed since
+        cache_key = data_dir_key()
+        if cache_key == datasets_cache['key']:
+            return jsonify({
+                'success': True,
+                'datasets': datasets_cache['value']
+            })
         
-        for filename in sorted(csv_files, reverse=True)[:10]:  # Last 10 files
+        dataset_files = list_dataset_files()
+        
+        for filename in sorted(dataset_files, reverse=True)[:10]:  # Last 10 files
             filepath = os.path.join(DATA_DIR, filename)
             
             # Get file info
@@ -193,20 +328,24 @@ def get_datasets():
             
             # Try to get row count
             try:
-                df = pd.read_csv(filepath)
-                row_count = len(df)
-                categories = df['category'].nunique() if 'category' in df.columns else 0
+                meta = read_dataset_meta(filepath)
+                row_count = meta['rows']
+                categories = meta['categories']
             except:
                 row_count = 0
                 categories = 0
             
             datasets.append({
                 'filename': filename,
+                'download': download_name(filename),
                 'size': file_size,
                 'created': datetime.fromtimestamp(file_time).isoformat(),
                 'rows': row_count,
                 'categories': categories
             })
+        
+        datasets_cache['value'] = datasets
+        datasets_cache['key'] = cache_key
     
     except Exception as e:
         pass
@@ -228,18 +367,19 @@ def get_data(filename):
                 'message': 'File not found'
             }), 404
         
-        df = pd.read_csv(filepath)
+        # Only the summary columns are needed for the counts
+        df = read_dataset(filepath, columns=SUMMARY_COLUMNS)
         
         # Get summary statistics
         summary = {
             'total_products': len(df),
-            'categories': df['category'].nunique() if 'category' in df.columns else 0,
-            'sources': df['source'].nunique() if 'source' in df.columns else 0,
-            'with_prices': df['price_numeric'].notna().sum() if 'price_numeric' in df.columns else 0
+            'categories': int(df['category'].nunique()) if 'category' in df.columns else 0,
+            'sources': int(df['source'].nunique()) if 'source' in df.columns else 0,
+            'with_prices': int(df['price_numeric'].notna().sum()) if 'price_numeric' in df.columns else 0
         }
         
         # Get sample data
-        sample = df.head(20).to_dict('records')
+        sample = read_preview(filepath, n_rows=20)
         
         # Category breakdown
         category_counts = df['category'].value_counts().to_dict() if 'category' in df.columns else {}
@@ -272,8 +412,16 @@ def download_file(filename):
 def get_stats():
     """Get overall statistics"""
     try:
-        # Find all CSV files
-        files = [f for f in os.listdir(DATA_DIR) if f.endswith('.csv')]
+        # Reuse the last stats if no dataset changed since
+        cache_key = data_dir_key()
+        if cache_key == stats_cache['key']:
+            return jsonify({
+                'success': True,
+                'stats': stats_cache['value']
+            })
+        
+        # Find all dataset files
+        files = list_dataset_files()
         
         if not files:
             # Return default stats if no files
@@ -299,18 +447,21 @@ def get_stats():
         files_with_time.sort(key=lambda x: x[1], reverse=True)
         latest_file = files_with_time[0][0]
         
-        # Read the latest file
-        df = pd.read_csv(os.path.join(DATA_DIR, latest_file))
+        # Read the latest file's metadata
+        meta = read_dataset_meta(os.path.join(DATA_DIR, latest_file))
         
         stats = {
             'total_datasets': len(files),
-            'total_products': int(len(df)),
-            'categories': int(df['category'].nunique()) if 'category' in df.columns else 0,
-            'sources': int(df['source'].nunique()) if 'source' in df.columns else 0,
+            'total_products': meta['rows'],
+            'categories': meta['categories'],
+            'sources': meta['sources'],
             'latest_scrape': latest_file,
-            'with_prices': int(df['price_numeric'].notna().sum()) if 'price_numeric' in df.columns else 0
+            'with_prices': meta['with_prices']
         }
         
+        stats_cache['value'] = stats
+        stats_cache['key'] = cache_key
+        
         return jsonify({
             'success': True,
             'stats': stats
@@ -331,12 +482,23 @@ def get_stats():
             }
         })
 if __name__ == '__main__':
+    import sys
+    
+    # Development: python app.py --debug (Flask dev server with reloader/debugger)
+    debug = '--debug' in sys.argv
+    
     print("\n" + "="*60)
     print("B2B MARKETPLACE SCRAPER - BACKEND API")
     print("="*60)
-    print("Starting Flask server...")
+    print("Starting Flask development server..." if debug else "Starting waitress server...")
     print("API will be available at: http://localhost:5000")
     print("Frontend will be available at: http://localhost:5000")
     print("="*60 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    if debug:
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        # Scrape status and caches live in this process, so serve with
+        # threads in a single process rather than multiple workers
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8)
@@ -3,35 +3,84 @@ Data Processor - ETL Pipeline
 Cleans and transforms scraped B2B marketplace data
 """
 
+import io
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import re
 from datetime import datetime
 import json
 
+# Common company suffixes stripped by clean_company_name
+_COMPANY_SUFFIXES = ('Pvt Ltd', 'Private Limited', 'Ltd', 'Inc', 'Corporation', 'Corp')
+
+# Common words dropped from product keywords
+_STOP_WORDS = frozenset({'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'for', 'with', 'from', 'to'})
+
+# Precompiled cleaner patterns
+_PRICE_NUM_RE = re.compile(r'(\d+\.?\d*)')
+_WS_RE = re.compile(r'\s+')
+_PRICE_UNIT_RE = re.compile(r'lakh|crore|\d\s*k\b', re.IGNORECASE)  # units the scraper's number ignores
+_SUFFIX_RE = re.compile(r'\b(' + '|'.join(re.escape(suffix) for suffix in _COMPANY_SUFFIXES) + r')\b\.?', re.IGNORECASE)
+
+# Common Indian states, matched in a single pass over each location
+_STATES = (
+    'Maharashtra', 'Gujarat', 'Delhi', 'Tamil Nadu', 'Karnataka',
+    'Uttar Pradesh', 'West Bengal', 'Rajasthan', 'Haryana',
+    'Telangana', 'Andhra Pradesh', 'Punjab', 'Madhya Pradesh'
+)
+_STATE_RE = re.compile('(' + '|'.join(re.escape(state) for state in _STATES) + ')', re.IGNORECASE)
+_STATE_RANK = {state.lower(): rank for rank, state in enumerate(_STATES)}  # earlier in _STATES wins
+
+def _as_text(series):
+    """Return a column as strings, with missing values as empty strings"""
+    return series.fillna('').astype(str)
+
+def _price_multiplier(price_str):
+    """Return the lakh/crore/k multiplier for each price string (1 when there is no unit)"""
+    lowered = price_str.str.lower()
+    return np.select(
+        [
+            lowered.str.contains('lakh', regex=False),
+            lowered.str.contains('crore', regex=False),
+            lowered.str.contains('k', regex=False),
+        ],
+        [100000, 10000000, 1000],
+        default=1
+    )
+
 class DataProcessor:
     def __init__(self, filepath):
         """
         Initialize the data processor
         
         Args:
-            filepath (str): Path to the raw data file (CSV or JSON)
+            filepath (str): Path to the raw data file (CSV, JSON or Parquet)
         """
         self.filepath = filepath
         self.df = None
         self.load_data()
     
     def load_data(self):
-        """Load data from CSV or JSON file"""
+        """Load data from CSV, JSON or Parquet file (CSV/JSON may be zstd-compressed .zst)"""
         try:
-            if self.filepath.endswith('.csv'):
-                self.df = pd.read_csv(self.filepath)
+            path, source = self.filepath, self.filepath
+            if path.endswith('.zst'):
+                with pa.input_stream(path, compression='zstd') as stream:
+                    source = io.BytesIO(stream.read())
+                path = path[:-len('.zst')]
+            
+            if path.endswith('.csv'):
+                self.df = pd.read_csv(source)
                 print(f"✓ Loaded CSV file: {self.filepath}")
-            elif self.filepath.endswith('.json'):
-                self.df = pd.read_json(self.filepath)
+            elif path.endswith('.json'):
+                self.df = pd.read_json(source)
                 print(f"✓ Loaded JSON file: {self.filepath}")
+            elif path.endswith('.parquet'):
+                self.df = pd.read_parquet(source)
+                print(f"✓ Loaded Parquet file: {self.filepath}")
             else:
-                raise ValueError("File must be CSV or JSON")
+                raise ValueError("File must be CSV, JSON or Parquet")
             
             print(f"  Initial shape: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
             
@@ -48,141 +97,117 @@ class DataProcessor:
         initial_rows = len(self.df)
         
         # 1. Remove duplicates
-        duplicates_before = self.df.duplicated().sum()
         self.df = self.df.drop_duplicates(subset=['name', 'company'], keep='first')
-        print(f"✓ Removed {duplicates_before} duplicate rows")
+        print(f"✓ Removed {initial_rows - len(self.df)} duplicate rows")
         
         # 2. Remove rows with missing critical data
-        missing_before = self.df.isnull().sum().sum()
         self.df = self.df.dropna(subset=['name'])
         print(f"✓ Removed rows with missing product names")
         
-        # 3. Clean price data
-        self.df['price_cleaned'] = self.df['price'].apply(self.clean_price)
+        # 3. Clean price data (reuse the scraper's numeric price; it ignores lakh/crore/k
+        #    units, so parse the text where it has a unit or the number is missing)
+        if 'price_numeric' in self.df.columns:
+            numeric = pd.to_numeric(self.df['price_numeric'], errors='coerce')
+            reparse = numeric.isna() | _as_text(self.df['price']).str.contains(_PRICE_UNIT_RE)
+            # mask builds a new column; assigning in place could write through to price_numeric
+            self.df['price_cleaned'] = numeric.mask(reparse, self.clean_price(self.df['price']))
+        else:
+            self.df['price_cleaned'] = self.clean_price(self.df['price'])
         print(f"✓ Cleaned price data")
         
         # 4. Standardize location data
-        self.df['location_cleaned'] = self.df['location'].apply(self.clean_location)
-        self.df['state'] = self.df['location_cleaned'].apply(self.extract_state)
+        self.df['location_cleaned'] = self.clean_location(self.df['location'])
+        self.df['state'] = self.extract_state(self.df['location_cleaned'])
         print(f"✓ Standardized location data")
         
         # 5. Clean company names
-        self.df['company_cleaned'] = self.df['company'].apply(self.clean_company_name)
+        self.df['company_cleaned'] = self.clean_company_name(self.df['company'])
         print(f"✓ Cleaned company names")
         
         # 6. Categorize price ranges
-        self.df['price_category'] = self.df['price_cleaned'].apply(self.categorize_price)
+        self.df['price_category'] = self.categorize_price(self.df['price_cleaned'])
         print(f"✓ Created price categories")
         
         # 7. Extract keywords from product names
-        self.df['product_keywords'] = self.df['name'].apply(self.extract_keywords)
+        self.df['product_keywords'] = self.extract_keywords(self.df['name'])
         print(f"✓ Extracted product keywords")
         
+        # 8. Store low-cardinality text columns as categoricals
+        # (price_cleaned stays float64: float32 skews the 2-decimal price means)
+        for col in ['category', 'source', 'state', 'price_category', 'company_cleaned']:
+            if col in self.df.columns:
+                self.df[col] = self.df[col].astype('category')
+        print(f"✓ Converted low-cardinality columns to categorical")
+        
         final_rows = len(self.df)
         print(f"\n  Final shape: {final_rows} rows, {self.df.shape[1]} columns")
         print(f"  Rows removed: {initial_rows - final_rows}")
         print("="*60)
     
-    def clean_price(self, price_text):
-        """Extract numeric price from text"""
-        if pd.isna(price_text) or price_text == "Price not available":
-            return np.nan
-        
-        # Remove currency symbols and extract numbers
-        price_str = str(price_text)
-        numbers = re.findall(r'\d+\.?\d*', price_str)
+    def clean_price(self, prices):
+        """Extract numeric prices from a column of price text"""
+        price_str = _as_text(prices)
         
-        if numbers:
-            price = float(numbers[0])
-            
-            # Handle lakhs/crores conversion
-            if 'lakh' in price_str.lower():
-                price = price * 100000
-            elif 'crore' in price_str.lower():
-                price = price * 10000000
-            elif 'k' in price_str.lower():
-                price = price * 1000
-            
-            return price
+        # Take the first number in each string (NaN when there is none)
+        numbers = price_str.str.extract(_PRICE_NUM_RE, expand=False).astype(float)
         
-        return np.nan
+        # Handle lakhs/crores conversion
+        return numbers * _price_multiplier(price_str)
     
-    def clean_location(self, location):
-        """Standardize location text"""
-        if pd.isna(location) or location == "Location not available":
-            return "Unknown"
+    def clean_location(self, locations):
+        """Standardize a column of location text"""
+        # Collapse extra whitespace and title case
+        cleaned = _as_text(locations).str.replace(_WS_RE, ' ', regex=True).str.strip().str.title()
         
-        # Remove extra whitespace
-        location = re.sub(r'\s+', ' ', str(location)).strip()
-        
-        # Title case
-        location = location.title()
-        
-        return location
+        missing = locations.isna() | (locations == "Location not available")
+        return cleaned.mask(missing, "Unknown")
     
-    def extract_state(self, location):
-        """Extract state from location string"""
-        if location == "Unknown":
-            return "Unknown"
-        
-        # Common Indian states
-        states = [
-            'Maharashtra', 'Gujarat', 'Delhi', 'Tamil Nadu', 'Karnataka',
-            'Uttar Pradesh', 'West Bengal', 'Rajasthan', 'Haryana',
-            'Telangana', 'Andhra Pradesh', 'Punjab', 'Madhya Pradesh'
-        ]
-        
-        for state in states:
-            if state.lower() in location.lower():
-                return state
-        
-        # If no state found, return the last part of location
-        parts = location.split(',')
-        return parts[-1].strip() if parts else "Unknown"
+    def extract_state(self, locations):
+        """Extract state from a column of location strings"""
+        # Of all states named in a location, keep the one listed first in _STATES
+        ranks = locations.str.extractall(_STATE_RE)[0].str.lower().map(_STATE_RANK)
+        found = ranks.groupby(level=0).min().map(dict(enumerate(_STATES))).reindex(locations.index)
+        
+        # If no state found, use the last part of location ("Unknown" stays "Unknown")
+        last_part = locations.str.rsplit(',', n=1).str[-1].str.strip()
+        return found.fillna(last_part).fillna("Unknown")
     
-    def clean_company_name(self, company):
-        """Clean company name"""
-        if pd.isna(company) or company == "Unknown":
-            return "Unknown"
-        
-        company = str(company).strip()
-        
+    def clean_company_name(self, companies):
+        """Clean a column of company names"""
         # Remove common suffixes
-        suffixes = ['Pvt Ltd', 'Private Limited', 'Ltd', 'Inc', 'Corporation', 'Corp']
-        for suffix in suffixes:
-            company = re.sub(rf'\b{suffix}\b\.?', '', company, flags=re.IGNORECASE)
-        
-        return company.strip().title()
+        cleaned = (
+            _as_text(companies).str.strip()
+            .str.replace(_SUFFIX_RE, '', regex=True)
+            .str.strip().str.title()
+        )
+        
+        missing = companies.isna() | (companies == "Unknown")
+        return cleaned.mask(missing, "Unknown")
     
-    def categorize_price(self, price):
-        """Categorize price into ranges"""
-        if pd.isna(price):
-            return "Unknown"
-        
-        if price < 1000:
-            return "Budget (< ₹1K)"
-        elif price < 10000:
-            return "Low (₹1K-10K)"
-        elif price < 50000:
-            return "Medium (₹10K-50K)"
-        elif price < 100000:
-            return "High (₹50K-1L)"
-        else:
-            return "Premium (> ₹1L)"
+    def categorize_price(self, prices):
+        """Categorize prices into ranges"""
+        categories = pd.cut(
+            prices,
+            bins=[-np.inf, 1000, 10000, 50000, 100000, np.inf],
+            labels=["Budget (< ₹1K)", "Low (₹1K-10K)", "Medium (₹10K-50K)",
+                    "High (₹50K-1L)", "Premium (> ₹1L)"],
+            right=False
+        )
+        
+        return categories.astype(object).fillna("Unknown")
     
-    def extract_keywords(self, product_name):
-        """Extract important keywords from product name"""
-        if pd.isna(product_name):
-            return []
-        
+    def extract_keywords(self, product_names):
+        """Extract important keywords from product names"""
         # Convert to lowercase and split
-        words = str(product_name).lower().split()
+        words = _as_text(product_names).str.lower().str.split()
         
         # Remove common words
-        stop_words = {'and', 'or', 'the', 'a', 'an', 'in', 'on', 'at', 'for', 'with', 'from', 'to'}
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        keywords = [
+            [word for word in row if word not in _STOP_WORDS and len(word) > 2][:5]  # Top 5 keywords
+            for row in words
+        ]
         
-        return keywords[:5]  # Top 5 keywords
+        return pd.Series(keywords, index=product_names.index)
     
     def add_derived_features(self):
         """Add additional analytical features"""
@@ -191,7 +216,7 @@ class DataProcessor:
         print("="*60)
         
         # 1. Product name length
-        self.df['name_length'] = self.df['name'].str.len()
+        self.df['name_length'] = self.df['name'].str.len().astype('Int32')
         print(f"✓ Added product name length")
         
         # 2. Has numeric price
@@ -199,7 +224,9 @@ class DataProcessor:
         print(f"✓ Added price availability flag")
         
         # 3. Category encoding
-        self.df['category_code'] = pd.Categorical(self.df['category']).codes
+        codes, uniques = pd.factorize(self.df['category'], sort=True)
+        code_dtype = next(t for t in (np.int8, np.int16, np.int32) if len(uniques) <= np.iinfo(t).max)
+        self.df['category_code'] = codes.astype(code_dtype)
         print(f"✓ Encoded categories")
         
         # 4. Data quality score (0-100)
@@ -210,16 +237,17 @@ class DataProcessor:
     
     def calculate_quality_score(self):
         """Calculate data quality score for each row"""
-        score = pd.Series(0, index=self.df.index)
-        
         # Points for having different fields
-        score += (~self.df['name'].isna()).astype(int) * 30
-        score += (~self.df['price_cleaned'].isna()).astype(int) * 25
-        score += (self.df['company'] != 'Unknown').astype(int) * 20
-        score += (self.df['location_cleaned'] != 'Unknown').astype(int) * 15
-        score += (~self.df['url'].isna()).astype(int) * 10
-        
-        return score
+        has_field = np.column_stack([
+            self.df['name'].notna().to_numpy(),
+            self.df['price_cleaned'].notna().to_numpy(),
+            (self.df['company'] != 'Unknown').to_numpy(),
+            (self.df['location_cleaned'] != 'Unknown').to_numpy(),
+            self.df['url'].notna().to_numpy()
+        ])
+        weights = np.array([30, 25, 20, 15, 10], dtype=np.int16)
+        
+        return pd.Series(has_field.astype(np.int8) @ weights, index=self.df.index)
     
     def generate_summary(self):
         """Generate data summary statistics"""
@@ -251,46 +279,73 @@ class DataProcessor:
         
         print("="*60)
     
-    def save_processed_data(self, output_prefix='processed'):
-        """Save cleaned data"""
+    def save_processed_data(self, output_prefix='processed', save_csv=False):
+        """
+        Save cleaned data
+        
+        Args:
+            output_prefix (str): Prefix for the output file names
+            save_csv (bool): Also write a CSV copy next to the Parquet file
+        """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        # Save as Parquet (primary format)
+        parquet_file = f'data/{output_prefix}_{timestamp}.parquet'
+        self.df.to_parquet(parquet_file, compression='snappy', index=False)
+        print(f"\n✓ Processed Parquet saved: {parquet_file}")
+        
+        # Save row/category counts so the API can list datasets without reading them
+        meta_file = f'data/{output_prefix}_{timestamp}.meta.json'
+        meta = {
+            'rows': len(self.df),
+            'categories': int(self.df['category'].nunique()),
+            'sources': int(self.df['source'].nunique()) if 'source' in self.df.columns else 0,
+            'with_prices': int(self.df['price_numeric'].notna().sum()) if 'price_numeric' in self.df.columns else 0
+        }
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        
         # Save as CSV
-        csv_file = f'data/{output_prefix}_{timestamp}.csv'
-        self.df.to_csv(csv_file, index=False, encoding='utf-8')
-        print(f"\n✓ Processed CSV saved: {csv_file}")
+        if save_csv:
+            csv_file = f'data/{output_prefix}_{timestamp}.csv'
+            with open(csv_file, 'w', buffering=1024 * 1024, encoding='utf-8', newline='') as f:
+                self.df.to_csv(f, index=False)
+            print(f"✓ Processed CSV saved: {csv_file}")
         
         # Save as Excel with multiple sheets
         excel_file = f'data/{output_prefix}_{timestamp}.xlsx'
-        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+        with pd.ExcelWriter(excel_file, engine='xlsxwriter') as writer:
             self.df.to_excel(writer, sheet_name='All Data', index=False)
             
             # Summary by category
-            category_summary = self.df.groupby('category').agg({
-                'name': 'count',
-                'price_cleaned': ['mean', 'median', 'min', 'max'],
-                'company_cleaned': 'nunique'
-            }).round(2)
+            category_summary = self.df.groupby('category', observed=True).agg(
+                products=('name', 'size'),
+                mean_price=('price_cleaned', 'mean'),
+                median_price=('price_cleaned', 'median'),
+                min_price=('price_cleaned', 'min'),
+                max_price=('price_cleaned', 'max'),
+                companies=('company_cleaned', 'nunique')
+            ).round(2)
             category_summary.to_excel(writer, sheet_name='Category Summary')
             
             # Summary by state
-            state_summary = self.df.groupby('state').agg({
-                'name': 'count',
-                'price_cleaned': 'mean',
-                'company_cleaned': 'nunique'
-            }).round(2).sort_values('name', ascending=False)
+            state_summary = self.df.groupby('state', observed=True).agg(
+                products=('name', 'size'),
+                mean_price=('price_cleaned', 'mean'),
+                companies=('company_cleaned', 'nunique')
+            ).round(2).sort_values('products', ascending=False)
             state_summary.to_excel(writer, sheet_name='State Summary')
         
         print(f"✓ Processed Excel saved: {excel_file}")
         
-        return csv_file, excel_file
+        return parquet_file, excel_file
 
 def main():
     """Main function for data processing"""
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python data_processor.py <data_file.csv|.json>")
+        print("Usage: python data_processor.py <data_file.csv|.json|.parquet>")
         return
     
     # Process data
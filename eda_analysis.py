@@ -4,18 +4,26 @@ Exploratory Data Analysis (EDA)
 Analyzes B2B marketplace data and generates insights with visualizations
 """
 
+import io
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from functools import cached_property
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style for better-looking plots
-sns.set_style('whitegrid')
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
+# Prefer the Rust calamine reader for Excel; pandas opens openpyxl workbooks read-only
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
+
+# Columns the analyzers group and count by
+_CATEGORICAL_COLUMNS = ('category', 'state', 'location_cleaned', 'company_cleaned', 'price_category')
 
 class EDAAnalyzer:
     def __init__(self, filepath):
@@ -27,68 +35,186 @@ class EDAAnalyzer:
         """
         self.filepath = filepath
         self.df = None
+        self._stats = None
         self.load_data()
     
     def load_data(self):
         """Load processed data"""
         try:
-            if self.filepath.endswith('.csv'):
-                self.df = pd.read_csv(self.filepath)
+            if self.filepath.endswith('.parquet'):
+                self.df = pd.read_parquet(self.filepath)
+            elif self.filepath.endswith('.csv'):
+                self.df = pd.read_csv(self.filepath, engine='pyarrow')
             elif self.filepath.endswith('.xlsx'):
-                self.df = pd.read_excel(self.filepath, sheet_name='All Data')
+                self.df = pd.read_excel(self.filepath, sheet_name='All Data', engine=_EXCEL_ENGINE)
+            
+            # Dictionary-encode the grouping columns so counts work on int codes
+            for col in _CATEGORICAL_COLUMNS:
+                if col in self.df.columns:
+                    self.df[col] = self.df[col].astype('category')
+            
+            # Scores are whole numbers in 0-100; store them in the narrowest int that fits
+            if 'quality_score' in self.df.columns:
+                self.df['quality_score'] = pd.to_numeric(self.df['quality_score'], downcast='integer')
             
             print(f"✓ Loaded data: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
+            self.scan_stats()
             
         except Exception as e:
             print(f"✗ Error loading data: {str(e)}")
             raise
     
+    def scan_stats(self):
+        """Collect null counts and key-column cardinalities in one scan"""
+        key_cols = [c for c in ('category', 'company_cleaned', 'location_cleaned')
+                    if c in self.df.columns]
+        self._stats = {
+            'nulls': self.df.isnull().sum(),
+            'nunique': self.df[key_cols].nunique(),
+        }
+        
+        # Row count and the count -> percentage factor used by every printer
+        self._n_rows = len(self.df)
+        self._pct = 100.0 / self._n_rows if self._n_rows else 0.0
+    
+    @cached_property
+    def category_summary(self):
+        """Product count and average price per category, from bincounts over the codes"""
+        categories = self.df['category'].cat
+        codes = categories.codes.to_numpy()
+        n_categories = len(categories.categories)
+        observed = codes >= 0
+        
+        summary = pd.DataFrame(
+            {'size': np.bincount(codes[observed], minlength=n_categories)},
+            index=categories.categories.rename('category'))
+        
+        if 'price_cleaned' in self.df.columns:
+            prices = self.df['price_cleaned'].to_numpy(dtype='float64')
+            valid = observed & ~np.isnan(prices)
+            sums = np.bincount(codes[valid], weights=prices[valid], minlength=n_categories)
+            counts = np.bincount(codes[valid], minlength=n_categories)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                summary['mean'] = sums / counts
+        
+        return summary[summary['size'] > 0]
+    
+    @cached_property
+    def cat_vc(self):
+        """Products per category, most common first"""
+        return self.category_summary['size'].sort_values(ascending=False)
+    
+    @cached_property
+    def state_vc(self):
+        """Products per state"""
+        return self.df['state'].value_counts()
+    
+    @cached_property
+    def city_vc(self):
+        """Products per city"""
+        return self.df['location_cleaned'].value_counts()
+    
+    @cached_property
+    def company_vc(self):
+        """Products per company"""
+        return self.df['company_cleaned'].value_counts()
+    
+    @cached_property
+    def price_cat_vc(self):
+        """Products per price range"""
+        return self.df['price_category'].value_counts()
+    
+    @cached_property
+    def companies_per_cat(self):
+        """Distinct companies per category"""
+        return self.df.groupby('category', observed=True)['company_cleaned'].nunique()
+    
+    @cached_property
+    def log_prices(self):
+        """log10(price + 1) of every listed price"""
+        prices = self.df['price_cleaned'].to_numpy(dtype='float64')
+        prices_log = prices[~np.isnan(prices)]
+        # Transform the filtered copy in place rather than allocating temporaries
+        np.log10(np.add(prices_log, 1, out=prices_log), out=prices_log)
+        return prices_log
+    
+    def precompute_aggregations(self):
+        """Fill the cached aggregations concurrently on a thread pool"""
+        attrs = ['category_summary']
+        for col, attr in (('state', 'state_vc'), ('location_cleaned', 'city_vc'),
+                          ('company_cleaned', 'company_vc'), ('company_cleaned', 'companies_per_cat'),
+                          ('price_category', 'price_cat_vc'), ('price_cleaned', 'log_prices')):
+            if col in self.df.columns:
+                attrs.append(attr)
+        
+        # Skip anything an earlier call already filled
+        attrs = [attr for attr in attrs if attr not in self.__dict__]
+        if not attrs:
+            return
+        
+        # pandas/NumPy release the GIL in their kernels, so these overlap
+        with ThreadPoolExecutor(max_workers=len(attrs)) as executor:
+            list(executor.map(lambda attr: getattr(self, attr), attrs))
+    
+    def write_section(self, section):
+        """Run a report section and emit its output with a single stdout write"""
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                section()
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    
     def perform_eda(self):
         """Perform complete exploratory data analysis"""
         print("\n" + "="*70)
         print("EXPLORATORY DATA ANALYSIS (EDA)")
         print("="*70)
         
+        # Run every aggregation the sections need as one concurrent batch up front
+        self.precompute_aggregations()
+        
         # 1. Basic statistics
-        self.display_basic_stats()
+        self.write_section(self.display_basic_stats)
         
         # 2. Category analysis
-        self.analyze_categories()
+        self.write_section(self.analyze_categories)
         
         # 3. Price analysis
-        self.analyze_prices()
+        self.write_section(self.analyze_prices)
         
         # 4. Location analysis
-        self.analyze_locations()
+        self.write_section(self.analyze_locations)
         
         # 5. Company analysis
-        self.analyze_companies()
+        self.write_section(self.analyze_companies)
         
         # 6. Data quality analysis
-        self.analyze_data_quality()
+        self.write_section(self.analyze_data_quality)
         
         # 7. Generate visualizations
         self.create_visualizations()
         
         # 8. Generate insights report
-        self.generate_insights()
+        self.write_section(self.generate_insights)
     
     def display_basic_stats(self):
         """Display basic dataset statistics"""
         print("\n📊 BASIC STATISTICS")
         print("-" * 70)
         
-        print(f"Total Products: {len(self.df)}")
-        print(f"Unique Categories: {self.df['category'].nunique()}")
-        print(f"Unique Companies: {self.df['company_cleaned'].nunique()}")
-        print(f"Unique Locations: {self.df['location_cleaned'].nunique()}")
+        print(f"Total Products: {self._n_rows}")
+        nunique = self._stats['nunique']
+        print(f"Unique Categories: {nunique['category']}")
+        print(f"Unique Companies: {nunique['company_cleaned']}")
+        print(f"Unique Locations: {nunique['location_cleaned']}")
         
         print(f"\nData Types:")
         print(self.df.dtypes.value_counts())
         
         print(f"\nMissing Values:")
-        missing = self.df.isnull().sum()
-        missing_pct = (missing / len(self.df)) * 100
+        missing = self._stats['nulls']
+        missing_pct = missing * self._pct
         missing_df = pd.DataFrame({
             'Missing Count': missing,
             'Percentage': missing_pct
@@ -100,17 +226,15 @@ class EDAAnalyzer:
         print("\n📦 CATEGORY ANALYSIS")
         print("-" * 70)
         
-        category_counts = self.df['category'].value_counts()
-        
         print(f"\nProducts per Category:")
-        for cat, count in category_counts.items():
-            pct = (count / len(self.df)) * 100
+        for cat, count in self.cat_vc.items():
+            pct = count * self._pct
             print(f"  {cat}: {count} ({pct:.1f}%)")
         
         # Average price by category (if available)
-        if 'price_cleaned' in self.df.columns:
+        if 'mean' in self.category_summary.columns:
             print(f"\nAverage Price by Category:")
-            avg_price = self.df.groupby('category')['price_cleaned'].mean().sort_values(ascending=False)
+            avg_price = self.category_summary['mean'].sort_values(ascending=False)
             for cat, price in avg_price.items():
                 if not pd.isna(price):
                     print(f"  {cat}: ₹{price:,.2f}")
@@ -131,7 +255,7 @@ class EDAAnalyzer:
             return
         
         print(f"\nPrice Statistics:")
-        print(f"  Products with price: {len(prices)} ({len(prices)/len(self.df)*100:.1f}%)")
+        print(f"  Products with price: {len(prices)} ({len(prices) * self._pct:.1f}%)")
         print(f"  Minimum: ₹{prices.min():,.2f}")
         print(f"  Maximum: ₹{prices.max():,.2f}")
         print(f"  Mean: ₹{prices.mean():,.2f}")
@@ -141,9 +265,8 @@ class EDAAnalyzer:
         # Price range distribution
         if 'price_category' in self.df.columns:
             print(f"\nPrice Range Distribution:")
-            price_dist = self.df['price_category'].value_counts()
-            for cat, count in price_dist.items():
-                pct = (count / len(self.df)) * 100
+            for cat, count in self.price_cat_vc.items():
+                pct = count * self._pct
                 print(f"  {cat}: {count} ({pct:.1f}%)")
     
     def analyze_locations(self):
@@ -154,16 +277,16 @@ class EDAAnalyzer:
         # Top states
         if 'state' in self.df.columns:
             print(f"\nTop 10 States by Product Count:")
-            top_states = self.df['state'].value_counts().head(10)
+            top_states = self.state_vc.head(10)
             for state, count in top_states.items():
-                pct = (count / len(self.df)) * 100
+                pct = count * self._pct
                 print(f"  {state}: {count} ({pct:.1f}%)")
         
         # Top cities
         print(f"\nTop 10 Cities by Product Count:")
-        top_cities = self.df['location_cleaned'].value_counts().head(10)
+        top_cities = self.city_vc.head(10)
         for city, count in top_cities.items():
-            pct = (count / len(self.df)) * 100
+            pct = count * self._pct
             print(f"  {city}: {count} ({pct:.1f}%)")
     
     def analyze_companies(self):
@@ -171,20 +294,19 @@ class EDAAnalyzer:
         print("\n🏢 COMPANY ANALYSIS")
         print("-" * 70)
         
-        total_companies = self.df['company_cleaned'].nunique()
+        total_companies = self._stats['nunique']['company_cleaned']
         print(f"\nTotal Unique Companies: {total_companies}")
         
         # Top companies by product count
         print(f"\nTop 10 Companies by Product Listings:")
-        top_companies = self.df['company_cleaned'].value_counts().head(10)
+        top_companies = self.company_vc.head(10)
         for company, count in top_companies.items():
             if company != 'Unknown':
                 print(f"  {company}: {count} products")
         
         # Companies per category
         print(f"\nAverage Companies per Category:")
-        companies_per_cat = self.df.groupby('category')['company_cleaned'].nunique()
-        for cat, count in companies_per_cat.items():
+        for cat, count in self.companies_per_cat.items():
             print(f"  {cat}: {count} companies")
     
     def analyze_data_quality(self):
@@ -196,17 +318,20 @@ class EDAAnalyzer:
             avg_quality = self.df['quality_score'].mean()
             print(f"\nAverage Quality Score: {avg_quality:.1f}/100")
             
-            # Quality distribution
-            quality_bins = pd.cut(self.df['quality_score'], bins=[0, 50, 70, 90, 100], 
-                                  labels=['Poor', 'Fair', 'Good', 'Excellent'])
+            # Quality distribution over the bins (0,50], (50,70], (70,90], (90,100]
+            scores = self.df['quality_score'].to_numpy(dtype='float64')
+            scores = scores[(scores > 0) & (scores <= 100)]
+            counts = np.bincount(np.digitize(scores, [50, 70, 90], right=True), minlength=4)
+            labels = ['Poor', 'Fair', 'Good', 'Excellent']
             print(f"\nQuality Distribution:")
-            for quality, count in quality_bins.value_counts().items():
-                pct = (count / len(self.df)) * 100
+            for i in np.argsort(-counts, kind='stable'):
+                quality, count = labels[i], counts[i]
+                pct = count * self._pct
                 print(f"  {quality}: {count} ({pct:.1f}%)")
         
         # Completeness by field
         print(f"\nField Completeness:")
-        completeness = ((~self.df.isnull()).sum() / len(self.df)) * 100
+        completeness = (self._n_rows - self._stats['nulls']) * self._pct
         for field, pct in completeness.sort_values(ascending=False).items():
             print(f"  {field}: {pct:.1f}%")
     
@@ -215,14 +340,26 @@ class EDAAnalyzer:
         print("\n📈 GENERATING VISUALIZATIONS")
         print("-" * 70)
         
+        # Plotting libraries are only imported when a figure is actually drawn
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        # Set style for better-looking plots
+        sns.set_style('whitegrid')
+        plt.rcParams['figure.figsize'] = (12, 6)
+        plt.rcParams['font.size'] = 10
+        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Create figure with subplots
-        fig = plt.figure(figsize=(20, 12))
+        # Aggregate first, then render each subplot from the cached results
+        self.precompute_aggregations()
+        
+        # Create figure with subplots; constrained layout fits them during the one save render
+        fig = plt.figure(figsize=(20, 12), layout='constrained')
         
         # 1. Category Distribution
         ax1 = plt.subplot(2, 3, 1)
-        category_counts = self.df['category'].value_counts()
+        category_counts = self.cat_vc
         colors = sns.color_palette('husl', len(category_counts))
         category_counts.plot(kind='bar', color=colors, ax=ax1)
         ax1.set_title('Product Distribution by Category', fontsize=14, fontweight='bold')
@@ -233,10 +370,9 @@ class EDAAnalyzer:
         # 2. Price Distribution
         ax2 = plt.subplot(2, 3, 2)
         if 'price_cleaned' in self.df.columns:
-            prices = self.df['price_cleaned'].dropna()
-            if len(prices) > 0:
+            prices_log = self.log_prices
+            if len(prices_log) > 0:
                 # Use log scale for better visualization
-                prices_log = np.log10(prices + 1)
                 ax2.hist(prices_log, bins=30, color='skyblue', edgecolor='black')
                 ax2.set_title('Price Distribution (Log Scale)', fontsize=14, fontweight='bold')
                 ax2.set_xlabel('Log10(Price + 1)')
@@ -245,7 +381,7 @@ class EDAAnalyzer:
         # 3. Top 10 States
         ax3 = plt.subplot(2, 3, 3)
         if 'state' in self.df.columns:
-            top_states = self.df['state'].value_counts().head(10)
+            top_states = self.state_vc.head(10)
             top_states.plot(kind='barh', color='coral', ax=ax3)
             ax3.set_title('Top 10 States by Products', fontsize=14, fontweight='bold')
             ax3.set_xlabel('Number of Products')
@@ -254,7 +390,7 @@ class EDAAnalyzer:
         # 4. Price Range Distribution
         ax4 = plt.subplot(2, 3, 4)
         if 'price_category' in self.df.columns:
-            price_cat_counts = self.df['price_category'].value_counts()
+            price_cat_counts = self.price_cat_vc
             colors_pie = sns.color_palette('Set2', len(price_cat_counts))
             ax4.pie(price_cat_counts.values, labels=price_cat_counts.index, autopct='%1.1f%%',
                    colors=colors_pie, startangle=90)
@@ -262,8 +398,8 @@ class EDAAnalyzer:
         
         # 5. Average Price by Category
         ax5 = plt.subplot(2, 3, 5)
-        if 'price_cleaned' in self.df.columns:
-            avg_price_cat = self.df.groupby('category')['price_cleaned'].mean().sort_values()
+        if 'mean' in self.category_summary.columns:
+            avg_price_cat = self.category_summary['mean'].sort_values()
             if not avg_price_cat.empty:
                 avg_price_cat.plot(kind='barh', color='lightgreen', ax=ax5)
                 ax5.set_title('Average Price by Category', fontsize=14, fontweight='bold')
@@ -281,14 +417,12 @@ class EDAAnalyzer:
             ax6.set_ylabel('Frequency')
             ax6.legend()
         
-        plt.tight_layout()
-        
         # Save figure
         viz_filename = f'data/eda_visualizations_{timestamp}.png'
-        plt.savefig(viz_filename, dpi=300, bbox_inches='tight')
+        fig.savefig(viz_filename, dpi=120)
         print(f"✓ Visualizations saved: {viz_filename}")
         
-        plt.close()
+        plt.close(fig)
     
     def generate_insights(self):
         """Generate key insights and recommendations"""
@@ -298,13 +432,13 @@ class EDAAnalyzer:
         insights = []
         
         # 1. Category insights
-        top_category = self.df['category'].value_counts().index[0]
-        top_cat_count = self.df['category'].value_counts().values[0]
+        top_category = self.cat_vc.index[0]
+        top_cat_count = self.cat_vc.values[0]
         insights.append(f"1. '{top_category}' is the most popular category with {top_cat_count} products")
         
         # 2. Price insights
-        if 'price_cleaned' in self.df.columns and self.df['price_cleaned'].notna().sum() > 0:
-            price_availability = (self.df['price_cleaned'].notna().sum() / len(self.df)) * 100
+        if 'price_cleaned' in self.df.columns and self._stats['nulls']['price_cleaned'] < self._n_rows:
+            price_availability = (self._n_rows - self._stats['nulls']['price_cleaned']) * self._pct
             insights.append(f"2. Only {price_availability:.1f}% of products have visible pricing")
             
             avg_price = self.df['price_cleaned'].mean()
@@ -312,13 +446,13 @@ class EDAAnalyzer:
         
         # 3. Location insights
         if 'state' in self.df.columns:
-            top_state = self.df['state'].value_counts().index[0]
-            top_state_count = self.df['state'].value_counts().values[0]
+            top_state = self.state_vc.index[0]
+            top_state_count = self.state_vc.values[0]
             insights.append(f"4. '{top_state}' has the most suppliers with {top_state_count} products")
         
         # 4. Company insights
-        total_companies = self.df['company_cleaned'].nunique()
-        avg_products_per_company = len(self.df) / total_companies
+        total_companies = self._stats['nunique']['company_cleaned']
+        avg_products_per_company = self._n_rows / total_companies
         insights.append(f"5. {total_companies} unique companies with avg {avg_products_per_company:.1f} products each")
         
         # 5. Data quality insights
@@ -365,22 +499,27 @@ class EDAAnalyzer:
             f.write("="*70 + "\n\n")
             f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Dataset: {self.filepath}\n")
-            f.write(f"Total Records: {len(self.df)}\n\n")
+            f.write(f"Total Records: {self._n_rows}\n\n")
             
             f.write("DATASET OVERVIEW\n")
             f.write("-"*70 + "\n")
-            f.write(self.df.describe(include='all').to_string())
+            numeric_cols = self.df.select_dtypes('number').columns
+            if len(numeric_cols) > 0:
+                f.write(self.df[numeric_cols].describe().to_string())
+                f.write("\n\n")
+            f.write("Unique values:\n")
+            f.write(self._stats['nunique'].to_string())
             f.write("\n\n")
             
             f.write("CATEGORY DISTRIBUTION\n")
             f.write("-"*70 + "\n")
-            f.write(self.df['category'].value_counts().to_string())
+            f.write(self.cat_vc.to_string())
             f.write("\n\n")
             
             if 'state' in self.df.columns:
                 f.write("TOP 15 STATES\n")
                 f.write("-"*70 + "\n")
-                f.write(self.df['state'].value_counts().head(15).to_string())
+                f.write(self.state_vc.head(15).to_string())
                 f.write("\n\n")
         
         print(f"\n✓ Summary report saved: {report_file}")
@@ -388,10 +527,8 @@ class EDAAnalyzer:
 
 def main():
     """Main function for EDA"""
-    import sys
-    
     if len(sys.argv) < 2:
-        print("Usage: python eda_analysis.py <processed_data.csv|.xlsx>")
+        print("Usage: python eda_analysis.py <processed_data.parquet|.csv|.xlsx>")
         return
     
     # Perform EDA
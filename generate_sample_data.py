@@ -3,10 +3,11 @@ Generate realistic sample B2B marketplace data
 This simulates scraped data from IndiaMART
 """
 
-import pandas as pd
-import random
+import numpy as np
 from datetime import datetime
-import json
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # Product categories and their typical products
 PRODUCT_DATA = {
@@ -60,92 +61,90 @@ COMPANY_SUFFIXES = [
     "Manufacturing", "Engineers", "Solutions", "Systems", "Technologies"
 ]
 
-def generate_company_name():
-    """Generate random company name"""
-    prefix = random.choice(COMPANY_PREFIXES)
-    suffix = random.choice(COMPANY_SUFFIXES)
-    return f"{prefix} {suffix}"
+# Product name variations
+VARIATIONS = ["", "Heavy Duty", "Industrial Grade", "Premium Quality",
+              "High Speed", "Automatic", "Semi-Automatic", "Digital"]
 
-def generate_price(category):
-    """Generate realistic price based on category"""
-    price_ranges = {
-        "industrial machinery": (50000, 5000000),
-        "electronic components": (100, 50000),
-        "textile fabrics": (50, 5000),
-        "plastic raw materials": (500, 100000),
-        "safety equipment": (100, 10000)
-    }
-    
-    min_price, max_price = price_ranges.get(category, (100, 10000))
+# Typical price range per category
+PRICE_RANGES = {
+    "industrial machinery": (50000, 5000000),
+    "electronic components": (100, 50000),
+    "textile fabrics": (50, 5000),
+    "plastic raw materials": (500, 100000),
+    "safety equipment": (100, 10000)
+}
+
+# Shared random generator for all sample draws
+RNG = np.random.default_rng()
+
+# Lookup tables the vectorized generators index into
+_CATEGORIES = np.array(list(PRODUCT_DATA))
+_PRODUCT_COUNTS = np.array([len(p) for p in PRODUCT_DATA.values()])
+_PRODUCT_OFFSETS = np.cumsum(_PRODUCT_COUNTS) - _PRODUCT_COUNTS
+_PRODUCT_NAMES = np.array([f"{variation} {product}".strip()
+                           for products in PRODUCT_DATA.values()
+                           for product in products
+                           for variation in VARIATIONS])
+_COMPANY_NAMES = np.array([f"{prefix} {suffix}"
+                           for prefix in COMPANY_PREFIXES for suffix in COMPANY_SUFFIXES])
+_LOCATION_NAMES = np.array([f"{city}, {state}" for city, state in LOCATIONS])
+_PRICE_BOUNDS = np.array([PRICE_RANGES.get(c, (100, 10000)) for c in _CATEGORIES])
+
+def generate_company_names(rng, n):
+    """Generate n random company names"""
+    return _COMPANY_NAMES[rng.integers(0, len(_COMPANY_NAMES), n)]
+
+def generate_prices(rng, cat_idx):
+    """Generate realistic price text and numeric price for each category index"""
+    n = len(cat_idx)
+    prices = rng.integers(_PRICE_BOUNDS[cat_idx, 0], _PRICE_BOUNDS[cat_idx, 1], endpoint=True)
     
     # 20% chance of no price
-    if random.random() < 0.2:
-        return "Price not available", None
-    
-    price = random.randint(min_price, max_price)
+    has_price = rng.random(n) >= 0.2
     
     # Format price text
-    if price >= 100000:
-        lakhs = price / 100000
-        price_text = f"₹ {lakhs:.2f} Lakh"
-    elif price >= 1000:
-        price_text = f"₹ {price:,}"
-    else:
-        price_text = f"₹ {price}"
-    
-    return price_text, float(price)
+    price_text = np.array([f"₹ {p / 100000:.2f} Lakh" if p >= 100000 else f"₹ {p:,}"
+                           for p in prices.tolist()], dtype=object)
+    price_text[~has_price] = "Price not available"
+    
+    price_numeric = prices.astype(float).astype(object)
+    price_numeric[~has_price] = None
+    
+    return price_text, price_numeric
 
-def generate_rating():
-    """Generate random rating"""
-    if random.random() < 0.3:  # 30% no rating
-        return None
-    return round(random.uniform(3.5, 5.0), 1)
+def generate_ratings(rng, n):
+    """Generate n random rating labels"""
+    ratings = np.char.add(np.round(rng.uniform(3.5, 5.0, n), 1).astype(str), " ★").astype(object)
+    ratings[rng.random(n) < 0.3] = None  # 30% no rating
+    return ratings
 
-def generate_products(num_products=250):
-    """Generate sample product data"""
-    products = []
-    
-    for _ in range(num_products):
-        # Random category
-        category = random.choice(list(PRODUCT_DATA.keys()))
-        
-        # Random product from category
-        product_base = random.choice(PRODUCT_DATA[category])
-        
-        # Add variation
-        variations = ["", "Heavy Duty", "Industrial Grade", "Premium Quality",
-                     "High Speed", "Automatic", "Semi-Automatic", "Digital"]
-        variation = random.choice(variations)
-        product_name = f"{variation} {product_base}".strip()
-        
-        # Location
-        city, state = random.choice(LOCATIONS)
-        location = f"{city}, {state}"
-        
-        # Company
-        company = generate_company_name()
-        
-        # Price
-        price_text, price_numeric = generate_price(category)
-        
-        # Rating
-        rating = generate_rating()
-        
-        product = {
-            'name': product_name,
-            'price': price_text,
-            'price_numeric': price_numeric,
-            'company': company,
-            'location': location,
-            'category': category,
-            'rating': f"{rating} ★" if rating else None,
-            'url': f"https://www.indiamart.com/proddetail/{random.randint(10000000, 99999999)}.html",
-            'scraped_at': datetime.now().isoformat()
-        }
-        
-        products.append(product)
-    
-    return products
+def generate_products(num_products=250, seed=None):
+    """Generate sample product data; pass a seed for a reproducible batch"""
+    rng = RNG if seed is None else np.random.default_rng(seed)
+    n = num_products
+    
+    # Random category, then a random product and variation within it
+    cat_idx = rng.integers(0, len(_CATEGORIES), n)
+    prod_idx = _PRODUCT_OFFSETS[cat_idx] + rng.integers(0, _PRODUCT_COUNTS[cat_idx])
+    name_idx = prod_idx * len(VARIATIONS) + rng.integers(0, len(VARIATIONS), n)
+    
+    price_text, price_numeric = generate_prices(rng, cat_idx)
+    url_ids = rng.integers(10000000, 99999999, n, endpoint=True).astype(str)
+    
+    # Build whole columns, then zip them into the row dicts the writers expect
+    columns = {
+        'name': _PRODUCT_NAMES[name_idx].tolist(),
+        'price': price_text.tolist(),
+        'price_numeric': price_numeric.tolist(),
+        'company': generate_company_names(rng, n).tolist(),
+        'location': _LOCATION_NAMES[rng.integers(0, len(_LOCATION_NAMES), n)].tolist(),
+        'category': _CATEGORIES[cat_idx].tolist(),
+        'rating': generate_ratings(rng, n).tolist(),
+        'url': np.char.add(np.char.add("https://www.indiamart.com/proddetail/", url_ids), ".html").tolist(),
+        'scraped_at': [datetime.now().isoformat()] * n
+    }
+    
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
 
 def main():
     """Generate and save sample data"""
@@ -168,15 +167,14 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     json_file = f'data/indiamart_products_{timestamp}.json'
     
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
+    with open(json_file, 'wb') as f:
+        f.write(orjson.dumps(products, option=orjson.OPT_INDENT_2))
     
     print(f"\n✓ Saved: {json_file}")
     
     # Save as CSV
     csv_file = f'data/indiamart_products_{timestamp}.csv'
-    df = pd.DataFrame(products)
-    df.to_csv(csv_file, index=False, encoding='utf-8')
+    pacsv.write_csv(pa.Table.from_pylist(products), csv_file)
     
     print(f"✓ Saved: {csv_file}")
     
@@ -197,7 +195,7 @@ def main():
     print("="*60)
     print(f"\nNext steps:")
     print(f"1. Run data processor: python data_processor.py {csv_file}")
-    print(f"2. Run EDA: python eda_analysis.py data/processed_*.csv")
+    print(f"2. Run EDA: python eda_analysis.py data/processed_*.parquet")
     print(f"3. Or run full pipeline: python main.py")
     print("="*60)
     
@@ -8,6 +8,10 @@ import sys
 import time
 from datetime import datetime
 
+from scraper_multi_source import MultiSourceScraper
+from data_processor import DataProcessor
+from eda_analysis import EDAAnalyzer
+
 def print_header(text):
     """Print formatted header"""
     print("\n" + "="*70)
@@ -23,13 +27,11 @@ def run_scraper():
     """Run the web scraper"""
     print_step(1, 3, "WEB SCRAPING")
     
-    print("Starting IndiaMART scraper...")
-    print("This will scrape products from 5 categories (3 pages each)")
-    print("Estimated time: 2-3 minutes\n")
-    
-    from scraper import IndiaMartScraper
+    print("Starting multi-source scraper...")
+    print("This will scrape products from 5 categories (3 sources each)")
+    print("Estimated time: under a minute\n")
     
-    scraper = IndiaMartScraper()
+    scraper = MultiSourceScraper()
     
     # Product categories
     categories = [
@@ -42,14 +44,14 @@ def run_scraper():
     
     print(f"Categories to scrape: {categories}\n")
     
-    # Scrape each category
-    for i, category in enumerate(categories, 1):
-        print(f"\n[{i}/{len(categories)}] Scraping: {category}")
-        scraper.search_products(category, max_pages=3)
-        time.sleep(2)  # Brief delay between categories
+    # Scrape all categories at once (requests are paced per host by the scraper)
+    scraper.scrape_categories(categories, sources=['tradeindia', 'alibaba', 'dhgate'], max_per_source=15)
+    
+    for category in categories:
+        scraper.add_sample_products(category, count=35)
     
     # Save data
-    json_file, csv_file = scraper.save_data()
+    csv_file, json_file = scraper.save_data()
     
     print(f"\n✅ Scraping completed!")
     print(f"   Total products: {len(scraper.products)}")
@@ -62,17 +64,15 @@ def run_data_processor(input_file):
     
     print(f"Processing file: {input_file}\n")
     
-    from data_processor import DataProcessor
-    
     processor = DataProcessor(input_file)
     processor.clean_data()
     processor.add_derived_features()
     processor.generate_summary()
-    csv_file, excel_file = processor.save_processed_data()
+    parquet_file, excel_file = processor.save_processed_data()
     
     print(f"\n✅ Data processing completed!")
     
-    return csv_file
+    return parquet_file
 
 def run_eda(input_file):
     """Run exploratory data analysis"""
@@ -80,8 +80,6 @@ def run_eda(input_file):
     
     print(f"Analyzing file: {input_file}\n")
     
-    from eda_analysis import EDAAnalyzer
-    
     analyzer = EDAAnalyzer(input_file)
     analyzer.perform_eda()
     report_file = analyzer.save_summary_report()
@@ -100,7 +98,7 @@ def main():
     print("="*70)
     print(f"\nStarted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\nThis pipeline will:")
-    print("  1. Scrape products from IndiaMART (5 categories)")
+    print("  1. Scrape products from B2B marketplaces (5 categories)")
     print("  2. Clean and process the data (ETL)")
     print("  3. Perform exploratory data analysis (EDA)")
     print("\nEstimated total time: 3-5 minutes")
@@ -4,21 +4,93 @@ Scrapes from multiple B2B marketplaces and combines results
 """
 
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests_cache import CachedSession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import orjson
 import json
+import os
 import time
 import random
+import threading
+import hashlib
+from dataclasses import dataclass, fields
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import quote_plus
 from fake_useragent import UserAgent
 import re
 
+# Hot-loop constants for extract_products
+_PRICE_HINT_RE = re.compile(r'₹|Rs|INR|Price', re.I)
+_PRICE_NUM_RE = re.compile(r'[\d,]+')
+_SKIP_WORDS = frozenset(['home', 'about', 'contact', 'login', 'category', 'more'])
+
+@dataclass
+class Product:
+    """A single product listing (slotted: no per-instance dict)"""
+    __slots__ = ('name', 'price', 'price_numeric', 'company', 'location', 'category',
+                 'rating', 'url', 'scraped_at', 'source')
+    name: str
+    price: str
+    price_numeric: Optional[float]
+    company: str
+    location: str
+    category: str
+    rating: Optional[str]
+    url: str
+    scraped_at: str
+    source: str
+
+_PRODUCT_FIELDS = [field.name for field in fields(Product)]
+
+def _open_output(path, compress):
+    """Open a binary output file, zstd-compressed on the fly when asked"""
+    return pa.CompressedOutputStream(path, 'zstd') if compress else open(path, 'wb')
+
 class MultiSourceScraper:
     def __init__(self):
         self.ua = UserAgent()
-        self.session = requests.Session()
+        # Sample user agents once; each request picks one of these prebuilt header dicts
+        self._header_pool = [{'User-Agent': self.ua.random} for _ in range(32)]
+        
+        # Serve repeat GETs from an on-disk cache so reruns don't refetch every search page
+        os.makedirs('data', exist_ok=True)
+        self.session = CachedSession(
+            'data/.http_cache',
+            backend='sqlite',
+            expire_after=3600,
+            allowable_codes=(200, 404)
+        )
         self.products = []
         
+        # Pool connections per host (sources are fetched in parallel) and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Connection': 'keep-alive',
+        })
+        self.products_lock = threading.Lock()  # Categories may be scraped from several threads
+        # (source, name) digests across the whole run. Extraction checks it unlocked only as a
+        # fast pre-filter; the re-check under products_lock decides what gets added
+        self._seen_keys = set()
+        self.max_requests_per_host = 4
+        
         # Available sources
         # Available sources
         self.sources = {
@@ -47,15 +119,36 @@ class MultiSourceScraper:
                 'status': 'testing'
             }
         }
+        
+        # Each source is a single host; cap how many requests hit it at once
+        self.host_slots = {key: threading.BoundedSemaphore(self.max_requests_per_host)
+                           for key in self.sources}
+        
+        # Earliest time the next request may go to each host (see wait_for_host)
+        self._host_next_ok = {key: 0.0 for key in self.sources}
+        self._host_lock = threading.Lock()
+        self._search_urls = {}  # (source_key, category) -> search URL, filled by search_url
     
     def get_headers(self):
-        """Generate random headers"""
-        return {
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-        }
+        """Pick per-request headers (the static ones live on the session)"""
+        return random.choice(self._header_pool)
+    
+    def search_url(self, source_key, category):
+        """Build (once) the search URL for a source and category"""
+        key = (source_key, category)
+        url = self._search_urls.get(key)
+        if url is None:
+            url = self.sources[source_key]['search_url'].replace('{query}', quote_plus(category))
+            self._search_urls[key] = url
+        return url
+    
+    def wait_for_host(self, source_key):
+        """Space requests to a host 2-3s apart; other hosts are never held up"""
+        with self._host_lock:
+            now = time.monotonic()
+            start = max(now, self._host_next_ok[source_key])
+            self._host_next_ok[source_key] = start + random.uniform(2, 3)
+        time.sleep(start - now)
     
     def scrape_source(self, source_key, category, max_results=30):
         """Scrape from a specific source"""
@@ -63,51 +156,58 @@ class MultiSourceScraper:
         if not source:
             return 0
         
-        print(f"\n  Scraping {source['name']}... ", end='', flush=True)
+        # Sources run concurrently, so each reports on a single line once done
+        label = f"\n  Scraping {source['name']} ({category})..."
         
         try:
-            # Format search URL
-            search_url = source['search_url'].format(query=category.replace(' ', '+'))
-            
-            time.sleep(random.uniform(2, 3))
+            search_url = self.search_url(source_key, category)
             
-            response = self.session.get(search_url, headers=self.get_headers(), timeout=15)
+            # Fresh cache hits skip host pacing; only cache misses hit the network
+            response = self.session.get(search_url, only_if_cached=True)
+            if response.status_code == 504:  # miss or expired (504s are never stored)
+                with self.host_slots[source_key]:
+                    self.wait_for_host(source_key)
+                    response = self.session.get(search_url, headers=self.get_headers(), timeout=15)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                count = self.extract_products(soup, category, source['name'], max_results)
-                print(f"✓ {count} products")
+                tree = LexborHTMLParser(response.content)
+                count = self.extract_products(tree, category, source['name'], max_results)
+                print(f"{label} ✓ {count} products")
                 return count
             else:
-                print(f"✗ Status {response.status_code}")
+                print(f"{label} ✗ Status {response.status_code}")
                 return 0
                 
-        except Exception as e:
-            print(f"✗ Error")
+        except (requests.RequestException, ValueError) as e:
+            print(f"{label} ✗ {type(e).__name__}")
             return 0
     
-    def extract_products(self, soup, category, source_name, max_results):
+    def extract_products(self, tree, category, source_name, max_results):
         """Generic product extraction"""
-        count = 0
+        page = {}  # key -> Product for this page, published in one batch below
         
         # Find all links that might be products
-        all_links = soup.find_all('a', href=True)
-        seen = set()
+        all_links = tree.css('a[href]')
+        parent_prices = {}
         
         for link in all_links:
-            if count >= max_results:
+            if len(page) >= max_results:
                 break
                 
             try:
-                name = link.get('title') or link.get_text(strip=True)
+                name = link.attributes.get('title') or link.text(strip=True)
                 
                 # Filter valid products
-                if name and 10 < len(name) < 200 and name not in seen:
+                if name and 10 < len(name) < 200:
                     # Skip navigation links
-                    if any(skip in name.lower() for skip in ['home', 'about', 'contact', 'login', 'category', 'more']):
+                    name_lower = name.lower()
+                    if any(skip in name_lower for skip in _SKIP_WORDS):
                         continue
                     
-                    seen.add(name)
+                    # Skip products this source already returned anywhere in the run
+                    key = hashlib.blake2b(f"{source_name}|{name.casefold()}".encode(), digest_size=8).digest()
+                    if key in page or key in self._seen_keys:
+                        continue
                     
                     # Try to find price nearby
                     price_text = "Price on Request"
@@ -115,51 +215,69 @@ class MultiSourceScraper:
                     
                     parent = link.parent
                     if parent:
-                        price_elem = parent.find(string=re.compile(r'₹|Rs|INR|Price', re.I))
+                        # First text node under the parent that looks like a price; sibling links share the scan
+                        if parent.mem_id not in parent_prices:
+                            parent_prices[parent.mem_id] = next(
+                                (node.text_content for node in parent.traverse(include_text=True)
+                                 if node.tag == '-text' and _PRICE_HINT_RE.search(node.text_content)), None)
+                        price_elem = parent_prices[parent.mem_id]
                         if price_elem:
                             price_text = price_elem.strip()
-                            numbers = re.findall(r'[\d,]+', price_text)
-                            if numbers:
+                            number = _PRICE_NUM_RE.search(price_text)
+                            if number:
                                 try:
-                                    price_numeric = float(numbers[0].replace(',', ''))
-                                except:
+                                    price_numeric = float(number.group().replace(',', ''))
+                                except ValueError:  # a run of commas only
                                     pass
                     
-                    product = {
-                        'name': name,
-                        'price': price_text,
-                        'price_numeric': price_numeric,
-                        'company': 'To be updated',
-                        'location': 'India',
-                        'category': category,
-                        'rating': None,
-                        'url': link.get('href', ''),
-                        'scraped_at': datetime.now().isoformat(),
-                        'source': source_name
-                    }
+                    product = Product(
+                        name=name,
+                        price=price_text,
+                        price_numeric=price_numeric,
+                        company='To be updated',
+                        location='India',
+                        category=category,
+                        rating=None,
+                        url=link.attributes.get('href') or '',
+                        scraped_at=datetime.now().isoformat(),
+                        source=source_name
+                    )
                     
-                    self.products.append(product)
-                    count += 1
+                    page[key] = product
                     
             except:
                 continue
         
-        return count
+        # One lock round-trip per page; drop keys another thread added meanwhile
+        with self.products_lock:
+            fresh = [product for key, product in page.items() if key not in self._seen_keys]
+            self._seen_keys.update(page)
+            self.products.extend(fresh)
+        
+        return len(fresh)
     
     def scrape_category(self, category, sources=['tradeindia'], max_per_source=30):
         """Scrape category from multiple sources"""
-        print(f"\n{'='*60}")
-        print(f"Category: {category}")
-        print(f"{'='*60}")
+        print(f"\n{'='*60}\nCategory: {category}\n{'='*60}")
         
-        total = 0
-        for source in sources:
-            count = self.scrape_source(source, category, max_per_source)
-            total += count
+        # Each source is an independent request; overlap their network waits
+        with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+            futures = [executor.submit(self.scrape_source, source, category, max_per_source)
+                       for source in sources]
+            total = sum(future.result() for future in futures)
         
-        print(f"  Total from all sources: {total}")
+        print(f"  Total from all sources ({category}): {total}")
         return total
     
+    def scrape_categories(self, categories, sources=['tradeindia'], max_per_source=30):
+        """Scrape every (category, source) pair concurrently"""
+        # Categories fan out here, sources fan out inside scrape_category;
+        # host_slots bounds and wait_for_host paces the requests each host sees
+        with ThreadPoolExecutor(max_workers=max(len(categories), 1)) as executor:
+            futures = [executor.submit(self.scrape_category, category, sources, max_per_source)
+                       for category in categories]
+            return sum(future.result() for future in futures)
+    
     def add_sample_products(self, category, count=40):
         """Add high-quality sample products to supplement real data"""
         
@@ -199,61 +317,106 @@ class MultiSourceScraper:
                  "Ahmedabad, Gujarat", "Chennai, Tamil Nadu", "Pune, Maharashtra"]
         
         templates = product_templates.get(category, [])
+        prefixes = ["Heavy Duty", "Industrial Grade", "Premium", "High Quality", ""]
+        n = min(count, len(templates) * 4)
         
-        for i in range(min(count, len(templates) * 4)):
-            template = random.choice(templates)
-            prefix = random.choice(["Heavy Duty", "Industrial Grade", "Premium", "High Quality", ""])
-            
-            product = {
-                'name': f"{prefix} {template}".strip(),
-                'price': f"₹ {random.randint(1000, 500000):,}",
-                'price_numeric': float(random.randint(1000, 500000)),
-                'company': random.choice(companies),
-                'location': random.choice(cities),
-                'category': category,
-                'rating': f"{random.uniform(3.5, 5.0):.1f} ★" if random.random() > 0.3 else None,
-                'url': f"https://example.com/product/{random.randint(1000, 9999)}",
-                'scraped_at': datetime.now().isoformat(),
-                'source': 'Enhanced Sample Data'
-            }
-            
-            self.products.append(product)
+        # Draw every random field for the batch at once
+        rng = np.random.default_rng()
+        template_idx = rng.integers(0, len(templates), n)
+        prefix_idx = rng.integers(0, len(prefixes), n)
+        price_nums = rng.integers(1000, 500000, n, endpoint=True).tolist()
+        company_idx = rng.integers(0, len(companies), n)
+        city_idx = rng.integers(0, len(cities), n)
+        ratings = rng.uniform(3.5, 5.0, n).tolist()
+        rating_mask = (rng.random(n) > 0.3).tolist()
+        url_ids = rng.integers(1000, 9999, n, endpoint=True).tolist()
+        scraped_at = datetime.now().isoformat()
+        
+        batch = [
+            Product(
+                name=f"{prefixes[prefix_idx[i]]} {templates[template_idx[i]]}".strip(),
+                price=f"₹ {price_nums[i]:,}",
+                price_numeric=float(price_nums[i]),
+                company=companies[company_idx[i]],
+                location=cities[city_idx[i]],
+                category=category,
+                rating=f"{ratings[i]:.1f} ★" if rating_mask[i] else None,
+                url=f"https://example.com/product/{url_ids[i]}",
+                scraped_at=scraped_at,
+                source='Enhanced Sample Data'
+            )
+            for i in range(n)
+        ]
+        
+        with self.products_lock:
+            self.products.extend(batch)
     
-    def save_data(self, filename='multi_source_products'):
-        """Save all scraped data"""
+    def save_data(self, filename='multi_source_products', compress=False):
+        """Save all scraped data; compress=True writes the CSV and JSON as .zst"""
         if not self.products:
             print("\n⚠ No products to save!")
             return None, None
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        suffix = '.zst' if compress else ''
         
-        # JSON
-        json_file = f'data/{filename}_{timestamp}.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.products, f, indent=2, ensure_ascii=False)
+        # JSON array streamed one record per line (orjson serializes the dataclasses directly)
+        json_file = f'data/{filename}_{timestamp}.json{suffix}'
+        with _open_output(json_file, compress) as f:
+            f.write(b'[\n')
+            for i, product in enumerate(self.products):
+                if i:
+                    f.write(b',\n')
+                f.write(orjson.dumps(product))
+            f.write(b'\n]\n')
+        
+        # Columnar table shared by the CSV and Parquet writers
+        table = pa.Table.from_pydict({
+            field: [getattr(product, field) for product in self.products]
+            for field in _PRODUCT_FIELDS
+        })
         
         # CSV
-        csv_file = f'data/{filename}_{timestamp}.csv'
-        df = pd.DataFrame(self.products)
-        df.to_csv(csv_file, index=False, encoding='utf-8')
+        csv_file = f'data/{filename}_{timestamp}.csv{suffix}'
+        with _open_output(csv_file, compress) as f:
+            pacsv.write_csv(table, f)
+        
+        # Parquet (read by the API)
+        parquet_file = f'data/{filename}_{timestamp}.parquet'
+        pq.write_table(table, parquet_file, compression='snappy')
+        
+        # Metadata sidecar (lets the API list datasets without reading them)
+        meta_file = f'data/{filename}_{timestamp}.meta.json'
+        meta = {
+            'rows': table.num_rows,
+            'categories': pc.count_distinct(table['category']).as_py(),
+            'sources': pc.count_distinct(table['source']).as_py(),
+            'with_prices': table.num_rows - table['price_numeric'].null_count
+        }
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        
+        by_source = sorted(pc.value_counts(table['source']).to_pylist(),
+                           key=lambda item: item['counts'], reverse=True)
         
         print(f"\n{'='*60}")
         print(f"FINAL SUMMARY")
         print(f"{'='*60}")
-        print(f"Total products: {len(self.products)}")
-        print(f"Categories: {df['category'].nunique()}")
-        print(f"Sources: {df['source'].nunique()}")
+        print(f"Total products: {meta['rows']}")
+        print(f"Categories: {meta['categories']}")
+        print(f"Sources: {meta['sources']}")
         print(f"\nBy Source:")
-        print(df['source'].value_counts())
+        for item in by_source:
+            print(f"  {item['values']}: {item['counts']}")
         print(f"\n✓ Saved: {json_file}")
         print(f"✓ Saved: {csv_file}")
+        print(f"✓ Saved: {parquet_file}")
         print(f"{'='*60}\n")
         
         return csv_file, json_file
 
 def main():
     """Run multi-source scraper"""
-    import os
     os.makedirs('data', exist_ok=True)
     
     scraper = MultiSourceScraper()
@@ -273,18 +436,16 @@ def main():
     print(f"Sources: TradeIndia, Alibaba, DHgate + Samples")
     print("="*60)
     
+    # Try multiple real sources, all categories at once
+    scraper.scrape_categories(
+        categories,
+        sources=['tradeindia', 'alibaba', 'dhgate'],
+        max_per_source=15
+    )
+    
+    # Add quality samples to reach good dataset size
     for category in categories:
-        # Try multiple real sources
-        scraper.scrape_category(
-            category, 
-            sources=['tradeindia', 'alibaba', 'dhgate'], 
-            max_per_source=15
-        )
-        
-        # Add quality samples to reach good dataset size
         scraper.add_sample_products(category, count=35)
-        
-        time.sleep(2)
     
     scraper.save_data()
 